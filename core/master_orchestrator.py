@@ -27,10 +27,16 @@ import sys
 import os
 import io
 import asyncio
+import functools
 import time
 import json
+import re
+import string
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, ClassVar
 from pathlib import Path
 from crewai import Crew, Task
 from core.comprehensive_agent_factory import ComprehensiveAgentFactory
@@ -38,17 +44,146 @@ from config.model_config import ModelConfig
 from core.rate_limiting import RateLimiter, ConcurrencyManager
 from core.error_recovery import RetryStrategy, ErrorHandler, CircuitBreaker, ErrorSeverity
 
+# Task description templates are built once at import; only the per-project
+# fields are substituted when tasks are created.
+_BACKEND_TASK_TMPL = string.Template("""You are building: $description
+
+YOUR CRITICAL TASK: Write ACTUAL working Python Flask backend code
+
+REQUIRED FILES:
+
+1. $workspace_path/src/app.py
+   - Complete Flask application
+   - ALL routes for: $description
+   - Actual functionality (not placeholders)
+   - Production-ready
+
+2. $workspace_path/src/config.py
+   - Configuration management
+   - Environment variables
+
+3. $workspace_path/src/__init__.py
+   - Package initialization
+
+4. $workspace_path/requirements.txt
+   - ALL dependencies
+
+5. $workspace_path/README.md
+   - Setup instructions
+   - API documentation
+
+CRITICAL:
+- Use WriteFileTool to save each file
+- Write REAL working code
+- Implement actual functionality
+- Make it production-ready
+
+IMPLEMENT:
+$requirements
+
+START: Write app.py using write_file_tool!""")
+
+_DOC_TASK_TMPL = string.Template("""Create comprehensive documentation.
+
+Read code from $workspace_path/src/app.py using read_file_tool
+
+Create:
+1. $workspace_path/docs/architecture.md - System design
+2. $workspace_path/docs/deployment.md - Deployment guide
+3. $workspace_path/docs/api.md - API documentation
+
+Use read_file_tool and write_file_tool""")
+
+_DEVOPS_TASK_TMPL = string.Template("""Create DevOps configuration.
+
+Create:
+1. $workspace_path/config/.env.example - Environment variables
+2. $workspace_path/config/docker-compose.yml - Docker setup
+3. $workspace_path/config/Dockerfile - Docker image
+4. $workspace_path/scripts/deploy.sh - Deployment script
+
+Use write_file_tool""")
+
+
+# Role keywords used to pick the agent for each generated task
+_TASK_ROLE_KEYWORDS = {
+    "backend": ("backend", "developer", "engineer", "architect"),
+    "documentation": ("architect", "analyst"),
+    "devops": ("devops",),
+}
+
+# Keyword -> risk factor, checked in order against the project type and requirements
+_RISK_KEYWORDS = {
+    "blockchain": "Smart contract security",
+    "ai": "Model performance",
+    "real-time": "Performance and latency",
+}
+
+# Complexity keywords; levels are checked in this order and the first hit wins
+_COMPLEXITY_INDICATORS = {
+    "simple": ["basic", "simple", "crud"],
+    "medium": ["authentication", "api", "database"],
+    "complex": ["microservices", "scalable"],
+    "advanced": ["ai", "blockchain", "machine learning"]
+}
+_COMPLEXITY_PATTERNS = {
+    level: re.compile("|".join(map(re.escape, keywords)))
+    for level, keywords in _COMPLEXITY_INDICATORS.items()
+}
+
+# File classification used by validate_and_finalize
+_CODE_EXTS = frozenset({"py", "js", "ts"})
+_DOC_EXTS = frozenset({"md", "txt"})
+_PKG_MANIFEST_NAMES = frozenset({"requirements.txt", "package.json"})
+
+# Subdirectories every project workspace starts with
+_WORKSPACE_SUBDIRS = ("src", "docs", "config", "scripts")
+
+
+def _create_workspace_dirs(workspace: Path):
+    """Create the empty project skeleton for a new workspace"""
+    for subdir in _WORKSPACE_SUBDIRS:
+        (workspace / subdir).mkdir(parents=True, exist_ok=True)
+
+
+def _walk_files(root: str):
+    """Yield os.DirEntry objects for every file under root (symlinks not followed)"""
+    # Like rglob, skip directories that vanish or can't be read mid-walk
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                yield from _walk_files(entry.path)
+            else:
+                yield entry
+
+
 class MasterOrchestrator:
     """Enhanced orchestrator with resilience, rate limiting, and error recovery"""
+    # Read-only after construction, so every orchestrator shares one instance
+    _shared_factory: ClassVar[Optional[ComprehensiveAgentFactory]] = None
+    _shared_model_config: ClassVar[Optional[ModelConfig]] = None
+
     def __init__(self):
-        self.agent_factory = ComprehensiveAgentFactory()
-        self.model_config = ModelConfig()
+        if MasterOrchestrator._shared_factory is None:
+            MasterOrchestrator._shared_factory = ComprehensiveAgentFactory()
+            MasterOrchestrator._shared_model_config = MasterOrchestrator._shared_factory.model_config
+        self.agent_factory = MasterOrchestrator._shared_factory
+        self.model_config = MasterOrchestrator._shared_model_config
         self.workspace_base = os.getenv("WORKSPACE_DIR", "workspace")
         self.rate_limiter = RateLimiter(workspace_dir=self.workspace_base)
         self.concurrency_manager = ConcurrencyManager(max_concurrent_requests=10)
         self.retry_strategy = RetryStrategy(max_retries=3, base_delay=1.0)
         self.error_handler = ErrorHandler(workspace_dir=self.workspace_base)
         self.circuit_breaker = CircuitBreaker(failure_threshold=5, timeout=60)
+        self._crew_executor = ThreadPoolExecutor(max_workers=int(os.getenv("CREW_WORKERS", "4")))
         self.request_counts = {"openrouter": 0, "groq": 0}
         self.session_start = time.time()
         self.projects_completed = 0
@@ -60,6 +195,11 @@ class MasterOrchestrator:
         }
         print("✅ Master Orchestrator initialized")
 
+    @functools.cached_property
+    def available_project_types(self) -> Dict[str, List[str]]:
+        """Project type categories from the agent factory, computed once per orchestrator"""
+        return self.agent_factory.list_available_project_types()
+
     def safe_write_file(self, filepath: Path, content: str):
         """Write file with proper UTF-8 encoding"""
         try:
@@ -82,12 +222,8 @@ class MasterOrchestrator:
             
             print(f"📁 Project workspace: {workspace_path}")
             
-            # Create workspace directories
-            Path(workspace_path).mkdir(parents=True, exist_ok=True)
-            Path(workspace_path, "src").mkdir(exist_ok=True)
-            Path(workspace_path, "docs").mkdir(exist_ok=True)
-            Path(workspace_path, "config").mkdir(exist_ok=True)
-            Path(workspace_path, "scripts").mkdir(exist_ok=True)
+            # Create workspace directories off the event loop
+            await asyncio.to_thread(_create_workspace_dirs, Path(workspace_path))
             
             # 2. Assess complexity
             complexity = self.assess_project_complexity(
@@ -108,6 +244,7 @@ class MasterOrchestrator:
                 raise Exception("Failed to create agent team")
             
             print(f"✅ {len(agents)} specialized agents ready\n")
+            await self.check_rate_limits(self._crew_provider(agents))
             
             # 4. Generate project plan
             project_plan = {
@@ -115,6 +252,10 @@ class MasterOrchestrator:
                 "project_type": project_requirements.get("type", "web_application"),
                 "description": project_requirements.get("description", ""),
                 "complexity": complexity,
+                "risk_factors": self.identify_risk_factors(
+                    project_requirements.get("type", "web_application"),
+                    project_requirements.get("custom_requirements", [])
+                ),
                 "agents": [agent.role for agent in agents],
                 "workspace": workspace_path
             }
@@ -155,14 +296,16 @@ class MasterOrchestrator:
             
             if len(existing_files) < 2:  # Agents didn't create files
                 print(f"⚠️  Agents didn't create files. Generating fallback...")
-                self.generate_backend_files(
+                await asyncio.to_thread(
+                    self.generate_backend_files,
                     workspace_path=workspace_path,
                     project_type=project_requirements.get("type", "web_application"),
                     description=project_requirements.get("description", ""),
                     custom_reqs=project_requirements.get("custom_requirements", [])
                 )
                 
-                self.generate_deployment_files(
+                await asyncio.to_thread(
+                    self.generate_deployment_files,
                     workspace_path=workspace_path,
                     project_type=project_requirements.get("type", "web_application"),
                     description=project_requirements.get("description", "")
@@ -173,7 +316,9 @@ class MasterOrchestrator:
                     description=project_requirements.get("description", ""),
                     custom_reqs=project_requirements.get("custom_requirements", [])
                 )
-                self.safe_write_file(Path(workspace_path) / "docs" / "architecture.md", arch_doc)
+                await asyncio.to_thread(
+                    self.safe_write_file, Path(workspace_path) / "docs" / "architecture.md", arch_doc
+                )
             
             # 8. Validate and finalize
             print(f"🔍 Validating project...")
@@ -207,6 +352,30 @@ class MasterOrchestrator:
                 "workspace_path": workspace_path if 'workspace_path' in locals() else None,
                 "partial_workspace": workspace_path if 'workspace_path' in locals() else None
             }
+
+    async def create_projects_batch(
+        self,
+        requirements_list: List[Dict[str, Any]],
+        max_concurrency: int = 3,
+        on_progress: Optional[Callable[[int, int, Dict[str, Any]], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """Create several projects concurrently, bounded by max_concurrency"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        total = len(requirements_list)
+        completed = 0
+
+        async def run_one(requirements: Dict[str, Any]) -> Dict[str, Any]:
+            nonlocal completed
+            async with semaphore:
+                result = await self.create_project(requirements)
+            completed += 1
+            if on_progress:
+                on_progress(completed, total, result)
+            return result
+
+        print(f"📦 Starting batch of {total} projects (max {max_concurrency} concurrent)")
+        return await asyncio.gather(*(run_one(reqs) for reqs in requirements_list))
+
     async def create_project_tasks(
         self,
         agents: List,
@@ -221,50 +390,26 @@ class MasterOrchestrator:
         custom_reqs = requirements.get("custom_requirements", [])
         tasks = []
 
+        # Pick the first matching agent for each task in a single pass over the team
+        primary = dict.fromkeys(_TASK_ROLE_KEYWORDS)
+        for agent in agents:
+            role = agent.role.lower()
+            for task_key, keywords in _TASK_ROLE_KEYWORDS.items():
+                if primary[task_key] is None and any(keyword in role for keyword in keywords):
+                    primary[task_key] = agent
+
         # TASK 1: BACKEND CODE GENERATION - AGENTS USE AI TO WRITE CODE
-        backend_agents = [agent for agent in agents if any(
-            role in agent.role.lower() 
-            for role in ["backend", "developer", "engineer", "architect"]
-        )]
-        if backend_agents:
-            dev_agent = backend_agents[0]
+        dev_agent = primary["backend"]
+        if dev_agent:
+            requirements_list = (
+                "\n".join(f"- {req}" for req in custom_reqs) if custom_reqs else "- Standard Flask app"
+            )
             backend_task = Task(
-                description=f"""You are building: {project_description}
-
-YOUR CRITICAL TASK: Write ACTUAL working Python Flask backend code
-
-REQUIRED FILES:
-
-1. {workspace_path}/src/app.py
-   - Complete Flask application
-   - ALL routes for: {project_description}
-   - Actual functionality (not placeholders)
-   - Production-ready
-
-2. {workspace_path}/src/config.py
-   - Configuration management
-   - Environment variables
-
-3. {workspace_path}/src/__init__.py
-   - Package initialization
-
-4. {workspace_path}/requirements.txt
-   - ALL dependencies
-
-5. {workspace_path}/README.md
-   - Setup instructions
-   - API documentation
-
-CRITICAL:
-- Use WriteFileTool to save each file
-- Write REAL working code
-- Implement actual functionality
-- Make it production-ready
-
-IMPLEMENT:
-{chr(10).join(f"- {req}" for req in custom_reqs) if custom_reqs else "- Standard Flask app"}
-
-START: Write app.py using write_file_tool!""",
+                description=_BACKEND_TASK_TMPL.substitute(
+                    description=project_description,
+                    workspace_path=workspace_path,
+                    requirements=requirements_list
+                ),
                 expected_output=f"All backend files in {workspace_path}/src/",
                 agent=dev_agent
             )
@@ -272,23 +417,10 @@ START: Write app.py using write_file_tool!""",
 
         # TASK 2: DOCUMENTATION
         if len(agents) > 1:
-            doc_agents = [agent for agent in agents if any(
-                role in agent.role.lower() 
-                for role in ["architect", "analyst"]
-            )]
-            if doc_agents:
-                doc_agent = doc_agents[0]
+            doc_agent = primary["documentation"]
+            if doc_agent:
                 doc_task = Task(
-                    description=f"""Create comprehensive documentation.
-
-Read code from {workspace_path}/src/app.py using read_file_tool
-
-Create:
-1. {workspace_path}/docs/architecture.md - System design
-2. {workspace_path}/docs/deployment.md - Deployment guide
-3. {workspace_path}/docs/api.md - API documentation
-
-Use read_file_tool and write_file_tool""",
+                    description=_DOC_TASK_TMPL.substitute(workspace_path=workspace_path),
                     expected_output=f"Documentation in {workspace_path}/docs/",
                     agent=doc_agent,
                     context=[backend_task]
@@ -296,19 +428,10 @@ Use read_file_tool and write_file_tool""",
                 tasks.append(doc_task)
 
         # TASK 3: DEVOPS
-        devops_agents = [agent for agent in agents if "devops" in agent.role.lower()]
-        if devops_agents:
-            devops_agent = devops_agents[0]
+        devops_agent = primary["devops"]
+        if devops_agent:
             devops_task = Task(
-                description=f"""Create DevOps configuration.
-
-Create:
-1. {workspace_path}/config/.env.example - Environment variables
-2. {workspace_path}/config/docker-compose.yml - Docker setup
-3. {workspace_path}/config/Dockerfile - Docker image
-4. {workspace_path}/scripts/deploy.sh - Deployment script
-
-Use write_file_tool""",
+                description=_DEVOPS_TASK_TMPL.substitute(workspace_path=workspace_path),
                 expected_output=f"Deployment files in {workspace_path}/config/",
                 agent=devops_agent,
                 context=[backend_task]
@@ -629,24 +752,49 @@ CMD ["python", "src/app.py"]
         
         return files
 
+    def _crew_provider(self, agents: List) -> str:
+        """Provider most of the crew's LLMs call, from their "<provider>/<model>" ids"""
+        providers = Counter(
+            str(getattr(getattr(agent, "llm", None), "model", "")).split("/", 1)[0]
+            for agent in agents
+        )
+        for provider, _ in providers.most_common():
+            if provider in self.rate_limiter.rate_limits:
+                return provider
+        return "openrouter"
+
     async def execute_with_monitoring(self, agents: List, tasks: List[Task], workspace_path: str) -> str:
         """Execute tasks"""
         print(f"⚙️  Executing {len(tasks)} tasks...")
         
         try:
+            provider = self._crew_provider(agents)
+            # Agents carry project-specific goals, so every project gets its own Crew.
+            # max_rpm makes crewai throttle each LLM call to the provider's limit.
             crew = Crew(
                 agents=agents,
                 tasks=tasks,
                 verbose=True,
                 memory=False,
+                max_rpm=self.rate_limiter.rate_limits[provider]["calls_per_minute"],
                 max_execution_time=7200,
                 process_timeout=1800
             )
             
-            result = await asyncio.to_thread(crew.kickoff)
+            loop = asyncio.get_running_loop()
+            result = await asyncio.wait_for(
+                loop.run_in_executor(self._crew_executor, crew.kickoff),
+                timeout=7200
+            )
+            token_usage = getattr(result, "token_usage", None)
+            if token_usage is not None:
+                self.rate_limiter.record_tokens(provider, getattr(token_usage, "total_tokens", 0))
             print(f"   ✅ Execution completed")
             return str(result)
             
+        except asyncio.TimeoutError:
+            print(f"   ❌ Execution timed out")
+            return "Execution timed out"
         except Exception as e:
             print(f"   ❌ Execution failed: {str(e)}")
             return str(e)
@@ -656,37 +804,43 @@ CMD ["python", "src/app.py"]
         print("✅ Validating...")
         
         workspace = Path(workspace_path)
-        all_files = list(workspace.rglob("*"))
-        code_files = [f for f in all_files if f.suffix in [".py", ".js", ".ts"]]
-        doc_files = [f for f in all_files if f.suffix in [".md", ".txt"]]
-        
-        quality_score = 0
-        if len(code_files) > 0:
-            quality_score += 20
-        if len(doc_files) > 0:
-            quality_score += 15
-        if (workspace / "README.md").exists():
-            quality_score += 10
-        if any(f.name in ["requirements.txt", "package.json"] for f in workspace.rglob("*")):
-            quality_score += 5
+        readme_path = os.path.join(workspace_path, "README.md")
+        total_count = code_count = doc_count = 0
+        has_readme = has_pkg_manifest = False
+        for entry in _walk_files(workspace_path):
+            total_count += 1
+            name = entry.name
+            ext = name.rpartition(".")[2] if "." in name else ""
+            if ext in _CODE_EXTS:
+                code_count += 1
+            elif ext in _DOC_EXTS:
+                doc_count += 1
+            if name in _PKG_MANIFEST_NAMES:
+                has_pkg_manifest = True
+            elif name == "README.md" and entry.path == readme_path:
+                has_readme = True
+        
+        quality_score = (
+            20 * (code_count > 0) + 15 * (doc_count > 0) + 10 * has_readme + 5 * has_pkg_manifest
+        )
         
         summary = f"""PROJECT GENERATION COMPLETE!
 
-Files Generated: {len(all_files)}
-Code Files: {len(code_files)}
-Documentation: {len(doc_files)}
+Files Generated: {total_count}
+Code Files: {code_count}
+Documentation: {doc_count}
 Quality Score: {quality_score}/100
 """
         
         report_file = workspace / "PROJECT_REPORT.md"
-        self.safe_write_file(report_file, summary)
+        await asyncio.to_thread(self.safe_write_file, report_file, summary)
         
         return {
             "quality_score": quality_score,
-            "files_generated": len(all_files),
+            "files_generated": total_count,
             "quality_metrics": {
-                "code_files": len(code_files),
-                "documentation_files": len(doc_files),
+                "code_files": code_count,
+                "documentation_files": doc_count,
             },
             "summary": summary.strip()
         }
@@ -695,21 +849,15 @@ Quality Score: {quality_score}/100
         """Generate ID"""
         timestamp = int(time.time())
         project_type = requirements.get("type", "custom")[:10]
-        return f"{project_type}_{timestamp}"
+        # Suffix keeps IDs unique when projects of the same type start together
+        return f"{project_type}_{timestamp}_{uuid.uuid4().hex[:6]}"
 
     def assess_project_complexity(self, description: str, custom_reqs: List) -> str:
         """Assess complexity"""
-        indicators = {
-            "simple": ["basic", "simple", "crud"],
-            "medium": ["authentication", "api", "database"],
-            "complex": ["microservices", "scalable"],
-            "advanced": ["ai", "blockchain", "machine learning"]
-        }
-        
         combined = f"{description.lower()} {' '.join(custom_reqs).lower()}"
         
-        for complexity, words in indicators.items():
-            if any(word in combined for word in words):
+        for complexity, pattern in _COMPLEXITY_PATTERNS.items():
+            if pattern.search(combined):
                 return complexity
         
         return "medium"
@@ -721,17 +869,8 @@ Quality Score: {quality_score}/100
 
     def identify_risk_factors(self, project_type: str, custom_reqs: List) -> List[str]:
         """Identify risks"""
-        risks = []
         combined = f"{project_type} {' '.join(custom_reqs)}".lower()
-        
-        if "blockchain" in combined:
-            risks.append("Smart contract security")
-        if "ai" in combined:
-            risks.append("Model performance")
-        if "real-time" in combined:
-            risks.append("Performance and latency")
-        
-        return risks
+        return [risk for keyword, risk in _RISK_KEYWORDS.items() if keyword in combined]
 
     def define_success_criteria(self, requirements: Dict) -> List[str]:
         """Success criteria"""
@@ -780,6 +919,7 @@ Quality Score: {quality_score}/100
             "execution_time": execution_time,
         }
 
-    async def check_rate_limits(self):
-        """Check rate limits"""
-        await self.rate_limiter.wait_if_needed("openrouter")
+    async def check_rate_limits(self, provider: str = "openrouter", estimated_cost: float = 1):
+        """Wait for the provider's token bucket before starting a project's crew"""
+        await self.rate_limiter.acquire(provider, estimated_cost)
+        self.request_counts[provider] = self.request_counts.get(provider, 0) + 1
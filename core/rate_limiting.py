@@ -2,17 +2,136 @@
 # Place this file at: core/rate_limiting.py
 
 import asyncio
+import atexit
 import time
-from typing import Dict, List
-from datetime import datetime, timedelta
+from collections import deque
+from typing import Dict, List, Optional
+from datetime import datetime
 import json
+import logging
 from pathlib import Path
+from core.error_recovery import RetryStrategy
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib encoder is used without it
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _dump_json(data) -> bytes:
+    """Serialize to indented JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def _load_json(raw: bytes):
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class AsyncTokenBucket:
+    """Async token bucket that throttles callers instead of only warning them"""
+    
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = None  # created on first acquire, inside the running loop
+    
+    def _refill(self):
+        """Add tokens earned since the last refill, capped at capacity"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_per_sec)
+        self.last_refill = now
+    
+    def wait_time(self, cost: float = 1) -> float:
+        """Seconds until `cost` tokens will be available"""
+        self._refill()
+        return max(0.0, (cost - self.tokens) / self.refill_per_sec)
+    
+    async def acquire(self, cost: float = 1):
+        """Wait until `cost` tokens are available, then consume them"""
+        cost = min(cost, self.capacity)
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        while True:
+            async with self._lock:
+                self._refill()
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    return
+                wait_time = (cost - self.tokens) / self.refill_per_sec
+            # Sleep outside the lock so other waiters can re-check the bucket
+            await asyncio.sleep(wait_time)
+
+
+class SlidingWindowCounter:
+    """Sliding-window-counter limiter: weights the previous window to avoid boundary bursts"""
+    
+    def __init__(self, limit: int, window_seconds: float = 60.0):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        now = time.monotonic()
+        self.current_start = now - (now % window_seconds)
+        self.current_count = 0
+        self.previous_count = 0
+        self._lock = None  # created on first acquire, inside the running loop
+    
+    def _rotate(self, now: float):
+        """Advance to the window containing `now`"""
+        window_start = now - (now % self.window_seconds)
+        if window_start != self.current_start:
+            # Only an immediately preceding window still carries weight
+            adjacent = window_start - self.current_start == self.window_seconds
+            self.previous_count = self.current_count if adjacent else 0
+            self.current_count = 0
+            self.current_start = window_start
+    
+    def _estimate(self, now: float) -> float:
+        """Requests counted against the limit at `now`"""
+        elapsed = (now - self.current_start) / self.window_seconds
+        return self.current_count + self.previous_count * (1 - elapsed)
+    
+    def wait_time(self, cost: float = 1) -> float:
+        """Seconds until `cost` more requests fit under the limit"""
+        now = time.monotonic()
+        self._rotate(now)
+        if self._estimate(now) + cost <= self.limit:
+            return 0.0
+        headroom = self.limit - cost - self.current_count
+        if headroom >= 0 and self.previous_count > 0:
+            # Wait for the previous window's weight to decay enough
+            needed = 1 - headroom / self.previous_count
+            return max(0.0, self.current_start + needed * self.window_seconds - now)
+        return max(0.0, self.current_start + self.window_seconds - now)
+    
+    async def acquire(self, cost: float = 1):
+        """Wait until `cost` requests fit under the limit, then count them"""
+        cost = min(cost, self.limit)
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self._rotate(now)
+                if self._estimate(now) + cost <= self.limit:
+                    self.current_count += cost
+                    return
+                wait_time = self.wait_time(cost)
+            # Sleep outside the lock so other waiters can re-check the window
+            await asyncio.sleep(wait_time)
 
 
 class RateLimiter:
     """Manages API rate limits and cost tracking across different providers"""
     
-    def __init__(self, workspace_dir: str = "workspace"):
+    def __init__(self, workspace_dir: str = "workspace", strategy: str = "token_bucket"):
         self.workspace_dir = Path(workspace_dir)
         self.workspace_dir.mkdir(exist_ok=True)
         
@@ -30,125 +149,190 @@ class RateLimiter:
             "google": {"cost_per_1k_tokens": 0}  # Free tier
         }
         
-        # Request tracking
-        self.request_history = {
-            "openrouter": [],
-            "groq": [],
-            "google": []
+        # Derived values, resolved once so hot paths skip nested .get() lookups
+        self._limits = {provider: cfg["calls_per_minute"] for provider, cfg in self.rate_limits.items()}
+        self._cost_per_1k = {
+            provider: cfg.get("cost_per_1k_tokens", 0) for provider, cfg in self.cost_tracking.items()
         }
         
+        # One limiter per provider: a token bucket refilled continuously at
+        # calls_per_minute / 60, or a sliding-window counter over 60s windows.
+        # Each has its own lock, so waiters for different providers never contend.
+        if strategy == "token_bucket":
+            self.buckets = {
+                provider: AsyncTokenBucket(limit, limit / 60.0)
+                for provider, limit in self._limits.items()
+            }
+        elif strategy == "sliding_window":
+            self.buckets = {
+                provider: SlidingWindowCounter(limit)
+                for provider, limit in self._limits.items()
+            }
+        else:
+            raise ValueError(f"Unknown rate limit strategy: {strategy}")
+        
+        # Request tracking (for usage statistics): monotonic timestamps, oldest first
+        self.request_history = {provider: deque() for provider in self.rate_limits}
+        self.token_windows = {provider: TokenUsageWindow() for provider in self.rate_limits}
+        
         self.stats_file = self.workspace_dir / ".orchestrator" / "api_stats.json"
+        self.stats_file.parent.mkdir(parents=True, exist_ok=True)
+        self._stats_cache = {}
+        self._last_updated = {}
+        self._stats_dirty = False
+        self._flush_task = None
         self.load_stats()
+        atexit.register(self.flush_stats)
     
     async def check_rate_limit(self, provider: str) -> bool:
         """Check if we're within rate limits"""
-        now = datetime.now()
-        one_minute_ago = now - timedelta(minutes=1)
-        
-        if provider not in self.request_history:
+        bucket = self.buckets.get(provider)
+        if bucket is None:
             return True
         
-        # Clean old requests
-        self.request_history[provider] = [
-            req_time for req_time in self.request_history[provider]
-            if req_time > one_minute_ago
-        ]
-        
-        # Check if we exceeded limit
-        limit = self.rate_limits.get(provider, {}).get("calls_per_minute", 60)
-        if len(self.request_history[provider]) >= limit:
-            wait_time = self._calculate_wait_time(provider)
-            print(f"⚠️  Rate limit approaching for {provider}")
-            print(f"   Current requests: {len(self.request_history[provider])}/{limit}")
-            print(f"   Consider waiting {wait_time:.1f} seconds before next call")
+        wait_time = bucket.wait_time()
+        if wait_time > 0:
+            logger.warning(
+                "Rate limit reached for %s (%d calls/min), next slot in %.1fs",
+                provider, self._limits[provider], wait_time
+            )
             return False
         
         return True
     
+    async def acquire(self, provider: str, cost: float = 1):
+        """Wait for and deduct rate-limit tokens before making a request"""
+        bucket = self.buckets.get(provider)
+        if bucket is not None:
+            await bucket.acquire(cost)
+    
+    def record_tokens(self, provider: str, tokens_used: int):
+        """Count tokens a provider consumed, for the per-minute usage summary"""
+        window = self.token_windows.get(provider)
+        if window is not None and tokens_used:
+            window.record(tokens_used)
+    
     def log_request(self, provider: str, tokens_used: int = 0, success: bool = True):
-        """Log API request for tracking"""
-        self.request_history[provider].append(datetime.now())
+        """Log API request for tracking (tokens are deducted by acquire)"""
+        self.request_history[provider].append(time.monotonic())
+        self._prune_history(provider)
         
         if success:
-            self.stats_file.parent.mkdir(parents=True, exist_ok=True)
             self._update_stats(provider, tokens_used)
+            self._ensure_flush_task()
+    
+    def _prune_history(self, provider: str):
+        """Drop requests older than one minute from the usage history"""
+        cutoff = time.monotonic() - 60.0
+        history = self.request_history[provider]
+        while history and history[0] <= cutoff:
+            history.popleft()
     
     def _calculate_wait_time(self, provider: str) -> float:
         """Calculate recommended wait time before next request"""
-        if not self.request_history[provider]:
+        bucket = self.buckets.get(provider)
+        if bucket is None:
             return 0
-        
-        oldest_request = self.request_history[provider][0]
-        current_time = datetime.now()
-        elapsed = (current_time - oldest_request).total_seconds()
-        wait_time = max(0, 60 - elapsed)  # Wait until oldest request is 1 minute old
-        
-        return wait_time
+        return bucket.wait_time()
     
     async def wait_if_needed(self, provider: str):
         """Wait if rate limit is about to be exceeded"""
-        while not await self.check_rate_limit(provider):
-            wait_time = self._calculate_wait_time(provider)
-            if wait_time > 0:
-                print(f"⏳ Waiting {wait_time:.1f}s to respect rate limits...")
-                await asyncio.sleep(min(wait_time, 10))  # Max 10s wait
+        # One sleep until the next token is due, instead of polling in 10s chunks
+        wait_time = self._calculate_wait_time(provider)
+        if wait_time > 0:
+            logger.info("Waiting %.1fs to respect %s rate limits", wait_time, provider)
+            await asyncio.sleep(wait_time)
     
     def get_stats(self) -> Dict:
         """Get current API usage statistics"""
+        for provider in self.request_history:
+            self._prune_history(provider)
         return {
             "timestamp": datetime.now().isoformat(),
             "request_history": {
                 provider: len(requests) for provider, requests in self.request_history.items()
             },
+            "tokens_last_minute": {
+                provider: window.tokens_in_window() for provider, window in self.token_windows.items()
+            },
             "estimated_cost": self._calculate_estimated_cost()
         }
     
     def _calculate_estimated_cost(self) -> Dict[str, float]:
         """Calculate estimated costs (should be $0 for free models)"""
         costs = {}
-        for provider, cost_config in self.cost_tracking.items():
+        for provider, cost_per_1k in self._cost_per_1k.items():
             requests = len(self.request_history.get(provider, []))
             # Assuming average 1000 tokens per request
             estimated_tokens = requests * 1000
-            estimated_cost = (estimated_tokens / 1000) * cost_config.get("cost_per_1k_tokens", 0)
+            estimated_cost = (estimated_tokens / 1000) * cost_per_1k
             costs[provider] = estimated_cost
         
         return costs
     
     def _update_stats(self, provider: str, tokens_used: int):
-        """Update statistics file"""
+        """Update in-memory statistics; flush_stats persists them"""
+        stats = self._stats_cache.setdefault(provider, {"requests": 0, "tokens": 0})
+        stats["requests"] += 1
+        stats["tokens"] += tokens_used
+        # Wall-clock seconds; converted to an ISO timestamp only when flushed
+        self._last_updated[provider] = time.time()
+        self._stats_dirty = True
+    
+    def flush_stats(self):
+        """Write statistics to disk atomically if they changed since the last flush"""
+        if not self._stats_dirty:
+            return
+        for provider, updated_at in self._last_updated.items():
+            self._stats_cache[provider]["last_updated"] = datetime.fromtimestamp(updated_at).isoformat()
+        self._last_updated.clear()
         try:
-            stats = {}
-            if self.stats_file.exists():
-                with open(self.stats_file, 'r') as f:
-                    stats = json.load(f)
-            
-            if provider not in stats:
-                stats[provider] = {"requests": 0, "tokens": 0}
-            
-            stats[provider]["requests"] += 1
-            stats[provider]["tokens"] += tokens_used
-            stats[provider]["last_updated"] = datetime.now().isoformat()
-            
-            with open(self.stats_file, 'w') as f:
-                json.dump(stats, f, indent=2)
+            tmp_file = self.stats_file.with_suffix(".tmp")
+            tmp_file.write_bytes(_dump_json(self._stats_cache))
+            tmp_file.replace(self.stats_file)
+            self._stats_dirty = False
         except Exception as e:
-            print(f"⚠️  Could not update stats: {e}")
+            logger.warning("Could not update stats: %s", e)
+    
+    def _ensure_flush_task(self):
+        """Start the periodic flush task on the running loop, if there is one"""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop (synchronous caller): flush immediately instead
+            self.flush_stats()
+            return
+        self._flush_task = loop.create_task(self._flush_loop())
+    
+    async def _flush_loop(self, interval: float = 5.0):
+        """Periodically persist statistics so requests never wait on disk I/O"""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                self.flush_stats()
+        finally:
+            self.flush_stats()
     
     def load_stats(self):
         """Load previous statistics if available"""
         if self.stats_file.exists():
             try:
-                with open(self.stats_file, 'r') as f:
-                    stats = json.load(f)
-                    print(f"📊 Loaded API usage statistics:")
+                with open(self.stats_file, 'rb') as f:
+                    stats = _load_json(f.read())
+                    self._stats_cache = stats
                     for provider, data in stats.items():
-                        print(f"   {provider}: {data.get('requests', 0)} requests, {data.get('tokens', 0)} tokens")
+                        logger.info(
+                            "Loaded API usage for %s: %d requests, %d tokens",
+                            provider, data.get("requests", 0), data.get("tokens", 0)
+                        )
             except Exception as e:
-                print(f"⚠️  Could not load stats: {e}")
+                logger.warning("Could not load stats: %s", e)
     
     def print_summary(self):
         """Print usage summary"""
+        self.flush_stats()
         stats = self.get_stats()
         print(f"\n📊 API USAGE SUMMARY")
         print(f"{'='*50}")
@@ -156,29 +340,98 @@ class RateLimiter:
         print(f"Recent Requests (last minute):")
         for provider, count in stats['request_history'].items():
             print(f"  {provider}: {count} requests")
+        print(f"Tokens (last minute):")
+        for provider, tokens in stats['tokens_last_minute'].items():
+            print(f"  {provider}: {tokens} tokens")
         print(f"Estimated Costs:")
         for provider, cost in stats['estimated_cost'].items():
             print(f"  {provider}: ${cost:.4f}")
         print(f"{'='*50}\n")
 
 
+class TokenUsageWindow:
+    """Sliding window of (timestamp, tokens_used) pairs for tokens-per-minute tracking"""
+    
+    def __init__(self, window_seconds: float = 60.0):
+        self.window_seconds = window_seconds
+        self.entries = deque()
+        self.total = 0
+    
+    def _evict(self, now: float):
+        """Drop entries older than the window"""
+        cutoff = now - self.window_seconds
+        while self.entries and self.entries[0][0] < cutoff:
+            _, tokens = self.entries.popleft()
+            self.total -= tokens
+    
+    def record(self, tokens_used: int):
+        """Record tokens consumed by a request"""
+        now = time.monotonic()
+        self._evict(now)
+        self.entries.append((now, tokens_used))
+        self.total += tokens_used
+    
+    def tokens_in_window(self) -> int:
+        """Tokens used within the current window"""
+        self._evict(time.monotonic())
+        return self.total
+
+
+def _rate_limit_retry_after(error: Exception) -> Optional[float]:
+    """Return the provider's Retry-After delay for a 429 error, or None for other errors"""
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429 and "RateLimit" not in type(error).__name__:
+        return None
+    
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("Retry-After", 0)))
+    except (TypeError, ValueError):
+        # HTTP-date form or garbage: fall back to the backoff schedule
+        return 0.0
+
+
 class ConcurrencyManager:
     """Manages concurrent API requests with proper throttling"""
     
-    def __init__(self, max_concurrent_requests: int = 10):
+    def __init__(self, max_concurrent_requests: int = 10, max_retries: int = 3,
+                 retry_strategy: Optional[RetryStrategy] = None):
         self.max_concurrent = max_concurrent_requests
-        self.semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self.semaphore = None  # created on first execute, inside the running loop
         self.active_requests = 0
+        self.max_retries = max_retries
+        self.retry_strategy = retry_strategy or RetryStrategy(max_retries=max_retries)
     
     async def execute(self, coro, provider: str, rate_limiter: RateLimiter):
-        """Execute coroutine with rate limiting and concurrency control"""
-        await rate_limiter.wait_if_needed(provider)
+        """Execute coroutine with rate limiting and concurrency control
         
-        async with self.semaphore:
-            self.active_requests += 1
+        Pass a zero-argument coroutine function instead of a coroutine object to
+        have provider 429s retried after Retry-After / exponential backoff.
+        """
+        if self.semaphore is None:
+            self.semaphore = asyncio.BoundedSemaphore(self.max_concurrent)
+        attempts = self.max_retries if callable(coro) else 1
+        
+        for attempt in range(attempts):
             try:
-                result = await coro
-                rate_limiter.log_request(provider)
-                return result
-            finally:
-                self.active_requests -= 1
\ No newline at end of file
+                async with self.semaphore:
+                    await rate_limiter.acquire(provider)
+                    self.active_requests += 1
+                    try:
+                        result = await (coro() if callable(coro) else coro)
+                        rate_limiter.log_request(provider)
+                        return result
+                    finally:
+                        self.active_requests -= 1
+            except Exception as e:
+                retry_after = _rate_limit_retry_after(e)
+                if retry_after is None or attempt == attempts - 1:
+                    raise
+                # Back off outside the semaphore so other requests can proceed
+                delay = max(retry_after, self.retry_strategy.calculate_delay(attempt))
+                logger.warning(
+                    "%s rate limited (attempt %d/%d), retrying in %.1fs",
+                    provider, attempt + 1, attempts, delay
+                )
+                await asyncio.sleep(delay)
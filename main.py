@@ -1,10 +1,15 @@
 # COMPLETE UPDATED MAIN.PY WITH ERROR HANDLING
 # Place this file at: main.py
 import io
+import argparse
 import asyncio
+import json
+import logging
 import os
+import re
 import sys
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
 from core.master_orchestrator import MasterOrchestrator
 
@@ -24,81 +29,100 @@ if sys.platform.startswith('win'):
 load_dotenv()
 
 
+# Menu data, built once at import
+_PROJECT_CATEGORIES = {
+    "Web & Mobile Applications": [
+        "Modern web applications with React/Vue + Node.js backend",
+        "Mobile apps with React Native or native iOS/Android",
+        "Progressive web apps with offline capabilities",
+        "E-commerce platforms with payment integration"
+    ],
+    "AI & Machine Learning": [
+        "Computer vision systems for image/video analysis",
+        "Natural language processing applications",
+        "Predictive analytics and recommendation engines",
+        "Chatbots and conversational AI systems"
+    ],
+    "Blockchain & Web3": [
+        "DeFi platforms with smart contracts and yield farming",
+        "NFT marketplaces with minting and trading",
+        "Cryptocurrency wallets and exchange platforms",
+        "Decentralized autonomous organizations (DAOs)"
+    ],
+    "IoT & Industrial": [
+        "Smart home automation systems",
+        "Industrial monitoring with predictive maintenance",
+        "Agricultural technology with sensor networks",
+        "Supply chain tracking and logistics"
+    ],
+    "FinTech & Business": [
+        "Payment processing and digital wallets",
+        "Algorithmic trading platforms",
+        "Personal finance management apps",
+        "Enterprise resource planning (ERP) systems"
+    ],
+    "Healthcare & Education": [
+        "Telemedicine platforms with video consultation",
+        "Electronic health records (EHR) systems",
+        "Online learning management systems",
+        "Educational content and assessment platforms"
+    ],
+    "Gaming & Entertainment": [
+        "Video games with multiplayer capabilities",
+        "Streaming platforms for content delivery",
+        "Social media and community platforms",
+        "AR/VR applications and experiences"
+    ],
+    "Security & Infrastructure": [
+        "Cybersecurity monitoring and threat detection",
+        "DevSecOps platforms and CI/CD pipelines",
+        "Cloud infrastructure management tools",
+        "Network monitoring and optimization systems"
+    ]
+}
+
+_PROJECT_TYPES = {
+    "1": ("web_application", "Web Application (websites, web apps)"),
+    "2": ("mobile_app", "Mobile Application (iOS, Android, cross-platform)"),
+    "3": ("ai_ml_application", "AI/ML Application (machine learning, data science)"),
+    "4": ("blockchain_project", "Blockchain/Web3 (DeFi, NFT, crypto)"),
+    "5": ("api_service", "API Service (REST APIs, microservices)"),
+    "6": ("iot_solution", "IoT Solution (sensors, devices, automation)"),
+    "7": ("fintech_application", "FinTech (payments, trading, finance)"),
+    "8": ("game_development", "Game Development (video games, AR/VR)"),
+    "9": ("healthtech_application", "HealthTech (medical, telemedicine)"),
+    "10": ("ecommerce_platform", "E-commerce (online stores, marketplaces)"),
+    "custom": ("custom", "Custom Type (I'll specify)")
+}
+
+_BANNER = "\n".join([
+    "=" * 80,
+    "🤖 ADVANCED MULTI-AGENT DEVELOPMENT SYSTEM",
+    "=" * 80,
+    "🚀 Transform your IDEAS into complete software projects",
+    "💡 From concept to production-ready code in minutes",
+    "🎯 Supports 40+ technologies: AI/ML, Blockchain, IoT, Web, Mobile & More",
+    "🤖 80+ Specialized AI agents working together",
+    "💰 Uses only FREE models - no API costs",
+    "=" * 80,
+])
+
+
 def display_banner():
     """Display system banner and capabilities"""
-    print("=" * 80)
-    print("🤖 ADVANCED MULTI-AGENT DEVELOPMENT SYSTEM")
-    print("=" * 80)
-    print("🚀 Transform your IDEAS into complete software projects")
-    print("💡 From concept to production-ready code in minutes")
-    print("🎯 Supports 40+ technologies: AI/ML, Blockchain, IoT, Web, Mobile & More")
-    print("🤖 80+ Specialized AI agents working together")
-    print("💰 Uses only FREE models - no API costs")
-    print("=" * 80)
+    print(_BANNER)
 
 
 def show_project_categories():
     """Display available project categories with examples"""
-    categories = {
-        "Web & Mobile Applications": [
-            "Modern web applications with React/Vue + Node.js backend",
-            "Mobile apps with React Native or native iOS/Android",
-            "Progressive web apps with offline capabilities",
-            "E-commerce platforms with payment integration"
-        ],
-        "AI & Machine Learning": [
-            "Computer vision systems for image/video analysis",
-            "Natural language processing applications",
-            "Predictive analytics and recommendation engines",
-            "Chatbots and conversational AI systems"
-        ],
-        "Blockchain & Web3": [
-            "DeFi platforms with smart contracts and yield farming",
-            "NFT marketplaces with minting and trading",
-            "Cryptocurrency wallets and exchange platforms",
-            "Decentralized autonomous organizations (DAOs)"
-        ],
-        "IoT & Industrial": [
-            "Smart home automation systems",
-            "Industrial monitoring with predictive maintenance",
-            "Agricultural technology with sensor networks",
-            "Supply chain tracking and logistics"
-        ],
-        "FinTech & Business": [
-            "Payment processing and digital wallets",
-            "Algorithmic trading platforms",
-            "Personal finance management apps",
-            "Enterprise resource planning (ERP) systems"
-        ],
-        "Healthcare & Education": [
-            "Telemedicine platforms with video consultation",
-            "Electronic health records (EHR) systems",
-            "Online learning management systems",
-            "Educational content and assessment platforms"
-        ],
-        "Gaming & Entertainment": [
-            "Video games with multiplayer capabilities",
-            "Streaming platforms for content delivery",
-            "Social media and community platforms",
-            "AR/VR applications and experiences"
-        ],
-        "Security & Infrastructure": [
-            "Cybersecurity monitoring and threat detection",
-            "DevSecOps platforms and CI/CD pipelines",
-            "Cloud infrastructure management tools",
-            "Network monitoring and optimization systems"
-        ]
-    }
-    
-    print("\n🎯 WHAT CAN WE BUILD FOR YOU?")
-    print("=" * 60)
+    lines = ["\n🎯 WHAT CAN WE BUILD FOR YOU?", "=" * 60]
     
-    for category, examples in categories.items():
-        print(f"\n📦 {category}:")
-        for i, example in enumerate(examples, 1):
-            print(f"   {i}. {example}")
+    for category, examples in _PROJECT_CATEGORIES.items():
+        lines.append(f"\n📦 {category}:")
+        lines.extend(f"   {i}. {example}" for i, example in enumerate(examples, 1))
     
-    print("\n...And many more! Describe any software idea and we'll build it.")
+    lines.append("\n...And many more! Describe any software idea and we'll build it.")
+    print("\n".join(lines))
 
 
 def get_user_idea():
@@ -121,32 +145,18 @@ def get_user_idea():
     
     # Get project type
     print(f"\n🎯 What type of project is this?")
-    project_types = {
-        "1": ("web_application", "Web Application (websites, web apps)"),
-        "2": ("mobile_app", "Mobile Application (iOS, Android, cross-platform)"),
-        "3": ("ai_ml_application", "AI/ML Application (machine learning, data science)"),
-        "4": ("blockchain_project", "Blockchain/Web3 (DeFi, NFT, crypto)"),
-        "5": ("api_service", "API Service (REST APIs, microservices)"),
-        "6": ("iot_solution", "IoT Solution (sensors, devices, automation)"),
-        "7": ("fintech_application", "FinTech (payments, trading, finance)"),
-        "8": ("game_development", "Game Development (video games, AR/VR)"),
-        "9": ("healthtech_application", "HealthTech (medical, telemedicine)"),
-        "10": ("ecommerce_platform", "E-commerce (online stores, marketplaces)"),
-        "custom": ("custom", "Custom Type (I'll specify)")
-    }
-    
-    for key, (_, desc) in project_types.items():
+    for key, (_, desc) in _PROJECT_TYPES.items():
         print(f"   {key}. {desc}")
     
     while True:
         choice = input(f"\nSelect project type (1-10 or 'custom'): ").strip().lower()
-        if choice in project_types:
+        if choice in _PROJECT_TYPES:
             if choice == "custom":
                 project_type = input("Enter your custom project type: ").strip()
                 if not project_type:
                     project_type = "custom_application"
             else:
-                project_type = project_types[choice][0]
+                project_type = _PROJECT_TYPES[choice][0]
             break
         print("❌ Invalid choice. Please try again.")
     
@@ -178,19 +188,18 @@ def get_user_idea():
     if additional:
         enhanced_description += f" Additional requirements: {additional}."
     
-    # Build custom requirements list
-    custom_requirements = []
-    if tech_preferences:
-        custom_requirements.extend(tech_preferences)
-    if key_features:
-        custom_requirements.extend(key_features)
+    # Build custom requirements list (dict keys dedupe while keeping input order)
+    custom_requirements = dict.fromkeys(tech_preferences)
+    custom_requirements.update(dict.fromkeys(key_features))
     if additional:
-        custom_requirements.extend([req.strip() for req in additional.replace(',', ' ').split() if len(req.strip()) > 2])
+        custom_requirements.update(
+            dict.fromkeys(req for req in re.split(r"[\s,]+", additional) if len(req) > 2)
+        )
     
     return {
         "description": enhanced_description,
         "type": project_type,
-        "custom_requirements": list(set(custom_requirements)),  # Remove duplicates
+        "custom_requirements": list(custom_requirements),
         "original_idea": description,
         "target_users": target_users,
         "tech_preferences": tech_preferences,
@@ -200,26 +209,88 @@ def get_user_idea():
 
 def show_project_summary(requirements):
     """Display project summary for confirmation"""
-    print(f"\n{'='*60}")
-    print("📋 PROJECT SUMMARY")
-    print("=" * 60)
-    print(f"Original Idea: {requirements['original_idea']}")
-    print(f"Project Type: {requirements['type'].replace('_', ' ').title()}")
-    print(f"Target Users: {requirements['target_users']}")
+    lines = [
+        f"\n{'='*60}",
+        "📋 PROJECT SUMMARY",
+        "=" * 60,
+        f"Original Idea: {requirements['original_idea']}",
+        f"Project Type: {requirements['type'].replace('_', ' ').title()}",
+        f"Target Users: {requirements['target_users']}",
+    ]
     if requirements['tech_preferences']:
-        print(f"Technologies: {', '.join(requirements['tech_preferences'])}")
+        lines.append(f"Technologies: {', '.join(requirements['tech_preferences'])}")
     if requirements['key_features']:
-        print(f"Key Features: {', '.join(requirements['key_features'])}")
+        lines.append(f"Key Features: {', '.join(requirements['key_features'])}")
     if requirements['custom_requirements']:
-        print(f"Requirements: {', '.join(requirements['custom_requirements'][:5])}")
+        lines.append(f"Requirements: {', '.join(requirements['custom_requirements'][:5])}")
         if len(requirements['custom_requirements']) > 5:
-            print(f"              ... and {len(requirements['custom_requirements']) - 5} more")
-    print(f"\n📄 Enhanced Description:")
-    print(f"   {requirements['description']}")
-    print("=" * 60)
+            lines.append(f"              ... and {len(requirements['custom_requirements']) - 5} more")
+    lines.append(f"\n📄 Enhanced Description:")
+    lines.append(f"   {requirements['description']}")
+    lines.append("=" * 60)
+    print("\n".join(lines))
+
+
+def _positive_int(value):
+    """argparse type for options that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"must be an integer, got {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def parse_args():
+    """Parse command-line options for non-interactive runs"""
+    parser = argparse.ArgumentParser(description="Multi-Agent Development System")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--spec", help="Path to a JSON project spec to build without prompts")
+    source.add_argument("--batch", help="Directory of JSON project specs to build concurrently")
+    parser.add_argument("--max-concurrency", type=_positive_int, default=3,
+                        help="Maximum projects built at once in batch mode (default: 3)")
+    return parser.parse_args()
+
+
+def load_project_spec(path):
+    """Load a project spec (same shape as create_project requirements) from JSON"""
+    with open(path, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+    if not isinstance(spec, dict):
+        raise ValueError(f"Spec {path} must be a JSON object")
+    if not spec.get("description"):
+        raise ValueError(f"Spec {path} is missing a description")
+    spec.setdefault("type", "web_application")
+    spec.setdefault("custom_requirements", [])
+    custom_requirements = spec["custom_requirements"]
+    if not isinstance(custom_requirements, list) or not all(isinstance(r, str) for r in custom_requirements):
+        raise ValueError(f"Spec {path}: custom_requirements must be a list of strings")
+    return spec
+
+
+async def run_batch(orchestrator, spec_paths, specs, max_concurrency):
+    """Build every loaded spec with one shared orchestrator and report each result"""
+    def on_progress(completed, total, result):
+        status = "✅" if result["success"] else "❌"
+        print(f"{status} [{completed}/{total}] {result['project_id']}")
+    
+    results = await orchestrator.create_projects_batch(
+        specs, max_concurrency=max_concurrency, on_progress=on_progress
+    )
+    
+    print(f"\n{'='*80}")
+    print("📦 BATCH SUMMARY")
+    print("=" * 80)
+    for path, result in zip(spec_paths, results):
+        if result["success"]:
+            print(f"✅ {path} -> {result['workspace_path']}")
+        else:
+            print(f"❌ {path}: {result.get('error', 'Unknown error')}")
+    print("=" * 80)
 
 
-async def main():
+async def main(args):
     display_banner()
     
     # Verify API keys
@@ -243,6 +314,22 @@ async def main():
         print(f"❌ Failed to initialize system: {e}")
         return
     
+    # Non-interactive modes
+    if args.spec or args.batch:
+        spec_paths = [args.spec] if args.spec else sorted(
+            str(path) for path in Path(args.batch).glob("*.json")
+        )
+        if not spec_paths:
+            print(f"❌ No project specs found in {args.batch}")
+            return
+        try:
+            specs = [load_project_spec(path) for path in spec_paths]
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not load project spec: {e}")
+            return
+        await run_batch(orchestrator, spec_paths, specs, args.max_concurrency)
+        return
+    
     # Main interaction loop
     while True:
         print(f"\n🎯 WHAT WOULD YOU LIKE TO DO?")
@@ -335,7 +422,7 @@ async def main():
             print("Storage: All files saved locally in organized structure")
             print("Technologies: Latest frameworks and best practices")
             
-            categories = orchestrator.agent_factory.list_available_project_types()
+            categories = orchestrator.available_project_types
             print(f"\nAvailable Project Categories ({len(categories)}):")
             for category in categories.keys():
                 print(f"  • {category}")
@@ -352,7 +439,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Surface rate-limit waits from core.* so long sleeps don't look like hangs,
+    # without turning on INFO chatter from third-party libraries
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logging.getLogger("core").setLevel(logging.INFO)
     try:
-        asyncio.run(main())
+        asyncio.run(main(parse_args()))
     except KeyboardInterrupt:
         print(f"\n\n👋 Goodbye! Thanks for using the Multi-Agent Development System!")
@@ -0,0 +1,36 @@
+"""Executors for blocking file-tool work.
+
+File tools (disk + encoding) run on FILE_POOL, sized to the CPU count, so a
+burst of large writes cannot starve the threads that LLM crews run on
+(MasterOrchestrator's crew executor, sized by CREW_WORKERS).
+FILE_SEM caps how many tool calls touch the filesystem at once, whether they
+arrive through the pool or through crewai's synchronous path.
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+FILE_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("FILE_WORKERS", str(os.cpu_count() or 4))),
+    thread_name_prefix="file-tools",
+)
+
+FILE_CONCURRENCY = int(os.getenv("FILE_CONCURRENCY", str((os.cpu_count() or 4) * 2)))
+FILE_SEM = threading.BoundedSemaphore(FILE_CONCURRENCY)
+
+
+def bounded_file_io(func):
+    """Hold FILE_SEM for the duration of a file tool call"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with FILE_SEM:
+            return func(*args, **kwargs)
+    return wrapper
+
+
+async def run_file_io(func, *args):
+    """Run a blocking file operation on FILE_POOL from async code"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(FILE_POOL, func, *args)
@@ -1,7 +1,27 @@
-from pathlib import Path
+import os
+from itertools import islice
 from crewai.tools import tool
+from tools._pools import bounded_file_io
+from tools.file_operations import (
+    MAX_DIR_ENTRIES, batch_write, get_cached_listing, read_text, store_listing,
+)
+
+
+def _walk_file_paths(root: str):
+    """Yield file paths under root, using the type info scandir already fetched"""
+    with os.scandir(root) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _walk_file_paths(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path
+            except OSError:
+                continue
+
 
 @tool("Write File Tool")
+@bounded_file_io
 def write_file_tool(filepath: str, content: str) -> str:
     """
     Write content to a file.
@@ -14,17 +34,13 @@ def write_file_tool(filepath: str, content: str) -> str:
         Success message or error
     """
     try:
-        file_path = Path(filepath)
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(file_path, 'w', encoding='utf-8', errors='replace') as f:
-            f.write(content)
-        
+        batch_write([(filepath, content)], errors='replace')
         return f"✅ Successfully wrote {len(content)} characters to {filepath}"
     except Exception as e:
         return f"❌ Error writing file: {str(e)}"
 
 @tool("Read File Tool")
+@bounded_file_io
 def read_file_tool(filepath: str) -> str:
     """
     Read content from a file.
@@ -36,13 +52,12 @@ def read_file_tool(filepath: str) -> str:
         File content or error message
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return content
+        return read_text(filepath)
     except Exception as e:
         return f"❌ Error reading file: {str(e)}"
 
 @tool("List Directory Tool")
+@bounded_file_io
 def list_directory_tool(dirpath: str) -> str:
     """
     List all files in a directory.
@@ -54,8 +69,15 @@ def list_directory_tool(dirpath: str) -> str:
         List of files or error message
     """
     try:
-        files = list(Path(dirpath).rglob("*"))
-        return "\n".join([str(f) for f in files if f.is_file()])
+        cached = get_cached_listing("tree", dirpath)
+        if cached is not None:
+            return cached
+        paths = list(islice(_walk_file_paths(dirpath), MAX_DIR_ENTRIES + 1))
+        if len(paths) > MAX_DIR_ENTRIES:
+            paths[-1] = f"… (truncated at {MAX_DIR_ENTRIES} files)"
+        listing = "\n".join(paths)
+        store_listing("tree", dirpath, listing)
+        return listing
     except Exception as e:
         return f"❌ Error listing directory: {str(e)}"
 
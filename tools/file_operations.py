@@ -1,58 +1,306 @@
+import codecs
+import functools
+import heapq
 import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from pathlib import Path
+from typing import Optional
 from crewai.tools import BaseTool
+from tools._pools import bounded_file_io, run_file_io
+
+
+@functools.lru_cache(maxsize=1024)
+def _as_path(path: str) -> Path:
+    """Return a (shared, immutable) Path for a path string"""
+    return Path(path)
+
+
+# Parent directories already created by the write tools. A racing duplicate
+# mkdir is harmless (exist_ok), so no lock is needed around the set.
+_created_dirs: set[Path] = set()
+
+
+def ensure_parent_dir(file_path: Path) -> None:
+    """Create file_path's parent directory once per process"""
+    parent = file_path.parent
+    if parent not in _created_dirs:
+        parent.mkdir(parents=True, exist_ok=True)
+        _created_dirs.add(parent)
+
+
+def forget_parent_dir(file_path: Path) -> None:
+    """Forget file_path's parent after it was removed"""
+    _created_dirs.discard(file_path.parent)
+
+
+def clear_dir_cache() -> None:
+    """Forget created directories (call after deleting workspace folders)"""
+    _created_dirs.clear()
+
+
+WRITE_CHUNK_SIZE = 1 << 16
+# Listings longer than this are truncated to keep tool output within an
+# agent's context window
+MAX_DIR_ENTRIES = 1000
+
+
+def write_text(file_path: Path, content: str, errors: str = "strict") -> None:
+    """Encode content as UTF-8 and write it in WRITE_CHUNK_SIZE blocks"""
+    try:
+        data = memoryview(content.encode("utf-8"))
+    except UnicodeEncodeError:
+        # Only lone surrogates fail here; let the caller's handler decide
+        if errors == "strict":
+            raise
+        data = memoryview(content.encode("utf-8", errors))
+    with open(file_path, "wb") as f:
+        for start in range(0, len(data), WRITE_CHUNK_SIZE):
+            f.write(data[start:start + WRITE_CHUNK_SIZE])
+    forget_metadata(file_path)
+
+
+# Directory listings keyed by (listing kind, absolute path). Agents list the
+# same workspace many times per run, so keep results for a few seconds and
+# drop them whenever a write lands underneath the listed directory.
+LISTING_TTL = 5.0
+LISTING_CACHE_SIZE = 256
+_listing_cache: "OrderedDict[tuple[str, str], tuple[float, str]]" = OrderedDict()
+_listing_lock = threading.Lock()
+
+
+def get_cached_listing(kind: str, directory: str):
+    """Return a fresh cached listing or None"""
+    key = (kind, os.path.abspath(directory))
+    with _listing_lock:
+        hit = _listing_cache.get(key)
+        if hit is None:
+            return None
+        if time.monotonic() - hit[0] > LISTING_TTL:
+            del _listing_cache[key]
+            return None
+        _listing_cache.move_to_end(key)
+        return hit[1]
+
+
+def store_listing(kind: str, directory: str, listing: str) -> None:
+    """Cache a listing, evicting the least recently used entry when full"""
+    key = (kind, os.path.abspath(directory))
+    with _listing_lock:
+        _listing_cache[key] = (time.monotonic(), listing)
+        _listing_cache.move_to_end(key)
+        if len(_listing_cache) > LISTING_CACHE_SIZE:
+            _listing_cache.popitem(last=False)
+
+
+def invalidate_listings(file_path) -> None:
+    """Drop cached listings of every directory containing file_path"""
+    target = os.path.abspath(file_path)
+    with _listing_lock:
+        stale = [key for key in _listing_cache
+                 if target.startswith(key[1].rstrip(os.sep) + os.sep)]
+        for key in stale:
+            del _listing_cache[key]
+
+
+# Per-file (size, mtime_ns, bytes or None) keyed by absolute path. Listings
+# record size/mtime as they stat entries; reads attach the file bytes so a
+# re-read of an unchanged file is served without touching the disk.
+METADATA_CACHE_SIZE = 512
+READ_CACHE_MAX_BYTES = 1 << 20
+_file_meta: "OrderedDict[str, tuple[int, int, Optional[bytes]]]" = OrderedDict()
+_meta_lock = threading.Lock()
+
+
+def record_metadata(path, st: os.stat_result, data: Optional[bytes] = None) -> None:
+    """Remember a file's size/mtime, keeping cached bytes if it is unchanged"""
+    key = os.path.abspath(path)
+    with _meta_lock:
+        if data is None:
+            old = _file_meta.get(key)
+            if old and old[0] == st.st_size and old[1] == st.st_mtime_ns:
+                data = old[2]
+        _file_meta[key] = (st.st_size, st.st_mtime_ns, data)
+        _file_meta.move_to_end(key)
+        if len(_file_meta) > METADATA_CACHE_SIZE:
+            _file_meta.popitem(last=False)
+
+
+def forget_metadata(path) -> None:
+    """Drop the cached metadata and bytes for path"""
+    with _meta_lock:
+        _file_meta.pop(os.path.abspath(path), None)
+
+
+READ_MAX_BYTES = 1 << 20
+TRUNCATION_MARKER = "\n…[truncated]"
+
+
+def _decode_head(data: bytes, max_bytes: Optional[int]) -> str:
+    """Decode data, cutting it to max_bytes and marking the cut"""
+    if max_bytes is None or len(data) <= max_bytes:
+        return data.decode("utf-8")
+    # The incremental decoder drops a character split by the cut instead of
+    # raising, while still rejecting invalid UTF-8 before it
+    head = codecs.getincrementaldecoder("utf-8")().decode(memoryview(data)[:max_bytes])
+    return head + TRUNCATION_MARKER
+
+
+def _read_upto(fd: int, size: int) -> bytes:
+    """Read up to size bytes, looping over short reads until EOF"""
+    data = os.read(fd, size)
+    if len(data) == size or not data:
+        return data
+    chunks = [data]
+    remaining = size - len(data)
+    while remaining and (chunk := os.read(fd, remaining)):
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_text(file_path, max_bytes: Optional[int] = None) -> str:
+    """Read a UTF-8 file (up to max_bytes), reusing cached bytes while size and mtime match"""
+    key = os.path.abspath(file_path)
+    st = os.stat(key)
+    with _meta_lock:
+        hit = _file_meta.get(key)
+    if hit and hit[2] is not None and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+        return _decode_head(hit[2], max_bytes)
+
+    # One os.read sized from fstat instead of the buffered reader's chunks.
+    # Asking for one extra byte tells us whether the file grew meanwhile; any
+    # other length (a short read, e.g. Linux's ~2 GiB cap per read()) means
+    # reading on until EOF.
+    fd = os.open(key, os.O_RDONLY)
+    try:
+        st = os.fstat(fd)
+        if max_bytes is not None and st.st_size > max_bytes:
+            # Only the head is wanted; one extra byte confirms the cut
+            return _decode_head(_read_upto(fd, max_bytes + 1), max_bytes)
+        data = os.read(fd, st.st_size + 1)
+        if len(data) != st.st_size:
+            chunks = [data]
+            while chunk := os.read(fd, 1 << 20):
+                chunks.append(chunk)
+            data = b"".join(chunks)
+    finally:
+        os.close(fd)
+    record_metadata(key, st, data if len(data) <= READ_CACHE_MAX_BYTES else None)
+    return _decode_head(data, max_bytes)
+
+
+def _write_one(file_path: Path, content: str, errors: str) -> None:
+    try:
+        write_text(file_path, content, errors)
+    except FileNotFoundError:
+        # The parent was removed since we created it; recreate it once
+        forget_parent_dir(file_path)
+        ensure_parent_dir(file_path)
+        write_text(file_path, content, errors)
+    invalidate_listings(file_path)
+
+
+def batch_write(items, errors: str = "strict") -> None:
+    """Write (path, content) pairs, creating each parent directory once"""
+    by_parent = defaultdict(list)
+    for file_path, content in items:
+        file_path = _as_path(file_path)
+        by_parent[file_path.parent].append((file_path, content))
+    for files in by_parent.values():
+        ensure_parent_dir(files[0][0])
+
+    pairs = [pair for files in by_parent.values() for pair in files]
+    if len(pairs) == 1:
+        _write_one(*pairs[0], errors)
+        return
+    # A private pool rather than FILE_POOL: callers may already be running on
+    # a FILE_POOL thread and must not wait on their own pool
+    with ThreadPoolExecutor(max_workers=min(8, len(pairs))) as pool:
+        futures = [pool.submit(_write_one, path, content, errors) for path, content in pairs]
+        for future in futures:
+            future.result()
+
 
 class FileWriteTool(BaseTool):
     name: str = "File Write Tool"
     description: str = "Writes content to a specified file in the workspace."
 
+    @bounded_file_io
     def _run(self, file_path: str, content: str) -> str:
         try:
-            full_path = Path(file_path)
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            batch_write([(file_path, content)])
             return f"✅ Successfully wrote to {file_path}"
         except Exception as e:
             return f"❌ Error writing to file: {str(e)}"
 
+    async def _arun(self, file_path: str, content: str) -> str:
+        """Run the write on FILE_POOL so the event loop keeps scheduling"""
+        return await run_file_io(self._run, file_path, content)
+
 class ReadFileTool(BaseTool):
     name: str = "Read File Tool"
-    description: str = "Reads the content of a specified file."
+    description: str = "Reads a specified file and returns its raw content."
 
-    def _run(self, file_path: str) -> str:
+    @bounded_file_io
+    def _run(self, file_path: str, max_bytes: int = READ_MAX_BYTES) -> str:
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            return f"📖 File content:\n{content}"
+            return read_text(file_path, max_bytes)
         except FileNotFoundError:
             return f"❌ File not found: {file_path}"
         except Exception as e:
             return f"❌ Error reading file: {str(e)}"
 
+    async def _arun(self, file_path: str, max_bytes: int = READ_MAX_BYTES) -> str:
+        """Run the read on FILE_POOL so the event loop keeps scheduling"""
+        return await run_file_io(self._run, file_path, max_bytes)
+
 class ListDirectoryTool(BaseTool):
     name: str = "List Directory Tool"
     description: str = "Lists contents of a directory."
 
+    @bounded_file_io
     def _run(self, directory_path: str = ".") -> str:
+        cached = get_cached_listing("dir", directory_path)
+        if cached is not None:
+            return cached
         try:
-            path = Path(directory_path)
+            path = _as_path(directory_path)
             if not path.exists():
                 return f"❌ Directory does not exist: {directory_path}"
 
+            with os.scandir(path) as it:
+                entries = list(it)
+            total = len(entries)
+            # Only the first MAX_DIR_ENTRIES names are shown, so select them
+            # instead of sorting the whole directory
+            entries = heapq.nsmallest(MAX_DIR_ENTRIES, entries, key=attrgetter("name"))
+
             items = []
-            for item in sorted(path.iterdir()):
-                if item.is_file():
-                    size = item.stat().st_size
-                    items.append(f"📄 {item.name} ({size} bytes)")
+            for entry in entries:
+                if entry.is_file():
+                    st = entry.stat()
+                    record_metadata(entry.path, st)
+                    size = st.st_size
+                    items.append(f"📄 {entry.name} ({size} bytes)")
                 else:
-                    items.append(f"📁 {item.name}/")
+                    items.append(f"📁 {entry.name}/")
+            if total > MAX_DIR_ENTRIES:
+                items.append(f"… ({total - MAX_DIR_ENTRIES} more)")
 
-            return f"📂 Directory contents:\n" + "\n".join(items)
+            listing = f"📂 Directory contents:\n" + "\n".join(items)
+            store_listing("dir", directory_path, listing)
+            return listing
         except Exception as e:
             return f"❌ Error listing directory: {str(e)}"
 
+    async def _arun(self, directory_path: str = ".") -> str:
+        """Run the scan on FILE_POOL so the event loop keeps scheduling"""
+        return await run_file_io(self._run, directory_path)
+
 class FileOperationTools:
     def __init__(self):
         self.directory_cache = {}  # Cache directory listings